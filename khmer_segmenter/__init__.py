@@ -1,3 +1,3 @@
-from .viterbi import KhmerSegmenter
+from .viterbi import KhmerSegmenter, get_segmenter
 
-__all__ = ["KhmerSegmenter"]
+__all__ = ["KhmerSegmenter", "get_segmenter"]
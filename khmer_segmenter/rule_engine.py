@@ -1,6 +1,221 @@
 import json
 import os
 import re
+import sys
+
+try:
+    from re import _parser as _re_parser  # Python 3.11+
+except ImportError:
+    try:
+        import sre_parse as _re_parser  # Older Pythons
+    except ImportError:
+        _re_parser = None
+
+# Trigger kinds
+TKIND_EXACT = 0
+TKIND_REGEX = 1
+TKIND_COMPLEX = 2
+
+# Actions (-1 = unknown/no-op)
+ACTION_NONE = -1
+ACTION_MERGE_NEXT = 0
+ACTION_MERGE_PREV = 1
+ACTION_KEEP = 2
+
+# Check targets (TGT_MISSING = unresolvable target string, always absent)
+TGT_PREV = 0
+TGT_CUR = 1
+TGT_NEXT = 2
+TGT_MISSING = 3
+
+# Check kinds (CHK_NONE = no value check)
+CHK_NONE = 0
+CHK_IS_SEPARATOR = 1
+CHK_IS_ISOLATED = 2
+
+
+class _Check:
+    """One compiled condition of a rule, with pre-resolved int codes."""
+    __slots__ = ('target', 'kind', 'expected', 'must_exist', 'has_value_check')
+
+    def __init__(self, raw):
+        self.target = {
+            "prev": TGT_PREV,
+            "next": TGT_NEXT,
+            "context": TGT_CUR,
+            "current": TGT_CUR,
+        }.get(raw.get("target"), TGT_MISSING)
+        self.kind = {
+            "is_separator": CHK_IS_SEPARATOR,
+            "is_isolated": CHK_IS_ISOLATED,
+        }.get(raw.get("check"), CHK_NONE)
+        self.expected = raw.get("value")
+        self.must_exist = raw.get("exists", False)
+        self.has_value_check = "check" in raw or "value" in raw
+
+
+def _enumerate_single_chars(parsed, _cap=4096):
+    """
+    Return the set of single characters an anchored pattern can match, or
+    None when the pattern is too complex to enumerate. Handles a lone
+    literal or character class between anchors, and branches of such.
+    """
+    out = set()
+
+    def add_unit(op, av):
+        name = str(op)
+        if name == 'LITERAL':
+            out.add(chr(av))
+            return True
+        if name == 'IN':
+            for iop, iav in av:
+                iname = str(iop)
+                if iname == 'LITERAL':
+                    out.add(chr(iav))
+                elif iname == 'RANGE':
+                    lo, hi = iav
+                    if len(out) + (hi - lo + 1) > _cap:
+                        return False
+                    out.update(map(chr, range(lo, hi + 1)))
+                else:
+                    return False  # NEGATE, CATEGORY, ... not enumerable
+            return True
+        return False
+
+    tokens = [t for t in parsed if str(t[0]) != 'AT']
+    if len(tokens) != 1:
+        return None
+    op, av = tokens[0]
+    if str(op) == 'BRANCH':
+        for alt in av[1]:
+            sub = [t for t in alt if str(t[0]) != 'AT']
+            if len(sub) != 1 or not add_unit(*sub[0]):
+                return None
+        return out
+    if add_unit(op, av):
+        return out
+    return None
+
+
+def _compile_check(check):
+    """
+    Partially evaluate one _Check into a specialized closure
+    (seg, out, segments, j, n, is_sep) -> bool, or None if the check can
+    never fail. Target resolution, existence gating and the check-kind
+    dispatch are all decided here, once at load time, instead of per
+    segment in apply_rules.
+    """
+    target = check.target
+    kind = check.kind
+    expected = check.expected
+
+    if kind == CHK_IS_SEPARATOR:
+        # A value check implies the target must exist (a missing target
+        # fails the condition), so the existence gate is folded in.
+        if target == TGT_PREV:
+            return lambda seg, out, segments, j, n, is_sep: \
+                bool(out) and is_sep(out[-1]) == expected
+        if target == TGT_NEXT:
+            return lambda seg, out, segments, j, n, is_sep: \
+                j < n and is_sep(segments[j]) == expected
+        if target == TGT_CUR:
+            return lambda seg, out, segments, j, n, is_sep: \
+                is_sep(seg) == expected
+        return lambda seg, out, segments, j, n, is_sep: False
+
+    if kind == CHK_IS_ISOLATED:
+        def isolated(seg, out, segments, j, n, is_sep):
+            prev_sep = is_sep(out[-1]) if out else True
+            next_sep = is_sep(segments[j]) if j < n else True
+            return (prev_sep and next_sep) == expected
+        if target == TGT_PREV:
+            return lambda seg, out, segments, j, n, is_sep: \
+                bool(out) and isolated(seg, out, segments, j, n, is_sep)
+        if target == TGT_NEXT:
+            return lambda seg, out, segments, j, n, is_sep: \
+                j < n and isolated(seg, out, segments, j, n, is_sep)
+        if target == TGT_CUR:
+            return isolated
+        return lambda seg, out, segments, j, n, is_sep: False
+
+    # No recognized value check: the condition reduces to an existence
+    # test when one was requested, and to a tautology otherwise.
+    if check.must_exist or check.has_value_check:
+        if target == TGT_PREV:
+            return lambda seg, out, segments, j, n, is_sep: bool(out)
+        if target == TGT_NEXT:
+            return lambda seg, out, segments, j, n, is_sep: j < n
+        if target == TGT_CUR:
+            return None
+        return lambda seg, out, segments, j, n, is_sep: False
+    return None
+
+
+def _compile_cond(checks):
+    """Fuse a rule's compiled checks into a single conjunction closure."""
+    fns = tuple(f for f in map(_compile_check, checks) if f is not None)
+    if not fns:
+        return None
+    if len(fns) == 1:
+        return fns[0]
+
+    def cond(seg, out, segments, j, n, is_sep):
+        for fn in fns:
+            if not fn(seg, out, segments, j, n, is_sep):
+                return False
+        return True
+    return cond
+
+
+class _Rule:
+    """A compiled rule. Slots + int codes avoid per-iteration dict probes."""
+    __slots__ = ('name', 'tkind', 'tval', 'regex', 'regex_idx', 'order',
+                 'checks', 'cond', 'action', 'min_len', 'max_len')
+
+    def __init__(self, raw):
+        self.name = raw.get("name")
+        trigger = raw["trigger"]
+        self.tkind = {
+            "exact_match": TKIND_EXACT,
+            "regex": TKIND_REGEX,
+            "complexity_check": TKIND_COMPLEX,
+        }[trigger["type"]]
+        self.tval = trigger["value"]
+        self.regex = trigger.get("regex_obj")
+        self.regex_idx = -1  # Assigned when the master alternation is built
+        self.order = -1  # Position in the priority-sorted rule list
+
+        # Segment-length bounds this trigger can possibly match; used to
+        # skip inapplicable rules without touching the regex engine.
+        self.min_len, self.max_len = self._trigger_widths()
+
+        self.checks = tuple(_Check(c) for c in raw.get("checks", ()))
+        self.cond = _compile_cond(self.checks)
+        self.action = {
+            "merge_next": ACTION_MERGE_NEXT,
+            "merge_prev": ACTION_MERGE_PREV,
+            "keep": ACTION_KEEP,
+        }.get(raw["action"], ACTION_NONE)
+
+    def _trigger_widths(self):
+        if self.tkind == TKIND_EXACT:
+            n = len(self.tval)
+            return n, n
+        if self.tkind == TKIND_COMPLEX and self.tval == "is_invalid_single":
+            # By contract, is_invalid_single only ever flags single chars.
+            return 1, 1
+        if self.tkind == TKIND_REGEX and _re_parser is not None:
+            try:
+                lo, hi = _re_parser.parse(self.tval).getwidth()
+            except Exception:
+                return 0, sys.maxsize
+            # Triggers use .match(), which accepts a prefix match, so the
+            # upper bound only holds for patterns anchored with a final $.
+            if self.tval.endswith("$") and not self.tval.endswith("\\$"):
+                return lo, hi
+            return lo, sys.maxsize
+        return 0, sys.maxsize
+
 
 class RuleBasedEngine:
     def __init__(self, check_invalid_single_func, is_separator_func):
@@ -13,6 +228,76 @@ class RuleBasedEngine:
         self.is_separator = is_separator_func
         self.rules = self._load_and_compile_rules()
 
+        # Partition rules into buckets so the common case (exact_match
+        # triggers) is a single dict lookup instead of a scan over all rules.
+        self._exact_rules = {}
+        self._scan_rules = []
+        regex_patterns = []
+        for order, rule in enumerate(self.rules):
+            rule.order = order
+            if rule.tkind == TKIND_EXACT:
+                self._exact_rules.setdefault(rule.tval, []).append(rule)
+            else:
+                if rule.tkind == TKIND_REGEX:
+                    # Position of this rule among the regex rules (priority order)
+                    rule.regex_idx = len(regex_patterns)
+                    regex_patterns.append(rule.tval)
+                self._scan_rules.append(rule)
+
+        # Pre-merge each exact bucket with the scan rules by global priority,
+        # so looking a segment up yields its full candidate list already in
+        # rules.json order — exact rules don't jump ahead of regex/complexity
+        # rules that outrank them, and apply_rules concatenates nothing.
+        for tval, bucket in self._exact_rules.items():
+            self._exact_rules[tval] = sorted(
+                bucket + self._scan_rules, key=lambda r: r.order
+            )
+
+        # Union all regex triggers into one alternation so the common case is a
+        # single C-level match per segment instead of one call per rule. The
+        # first matching alternative is the highest-priority matching rule;
+        # lower-priority rules only need an individual re-check when a
+        # higher-priority match fails its conditions.
+        self._regex_master = None
+        if regex_patterns:
+            self._regex_master = re.compile(
+                "|".join(f"(?P<r{idx}>{pat})" for idx, pat in enumerate(regex_patterns))
+            )
+
+        # If no trigger can ever fire on a separator segment, apply_rules can
+        # push separators straight to the output without scanning any rules.
+        # On mixed text a large share of segments are separators.
+        self._separators_never_trigger = not any(
+            self._can_trigger_on_separator(rule) for rule in self.rules
+        )
+
+    def _can_trigger_on_separator(self, rule):
+        """
+        Conservatively decide whether a rule's trigger might match a
+        separator segment. Separators are single characters by the
+        is_separator contract (multi-char segments are never separators),
+        which bounds what needs checking; anything unprovable returns True.
+        """
+        if rule.min_len > 1:
+            return False
+        if rule.tkind == TKIND_EXACT:
+            return self.is_separator(rule.tval)
+        if rule.tkind == TKIND_COMPLEX:
+            # is_invalid_single explicitly excludes separators by contract.
+            return rule.tval != "is_invalid_single"
+        # Regex: enumerate the single characters the pattern can match, when
+        # it is a simple anchored literal/class (possibly a branch of such).
+        if _re_parser is None:
+            return True
+        try:
+            parsed = _re_parser.parse(rule.tval)
+        except Exception:
+            return True
+        chars = _enumerate_single_chars(parsed)
+        if chars is None:
+            return True  # Pattern too complex to prove separator-free
+        return any(self.is_separator(c) for c in chars)
+
     def _load_and_compile_rules(self):
         rule_path = os.path.join(os.path.dirname(__file__), "rules.json")
         try:
@@ -32,12 +317,11 @@ class RuleBasedEngine:
                     except re.error as e:
                         print(f"Error compiling trigger regex for rule '{rule.get('name')}': {e}")
                         continue
-                
-                # Check for "value" in trigger for exact match optimization
-                # (Nothing needed, just keep the detailed object)
-                
-                compiled_rules.append(rule)
-                
+
+                # Freeze into a slots object: attribute loads and int compares
+                # in the hot loop instead of nested dict probes.
+                compiled_rules.append(_Rule(rule))
+
             return compiled_rules
             
         except Exception as e:
@@ -47,122 +331,142 @@ class RuleBasedEngine:
     def apply_rules(self, segments):
         """
         Apply rules to the list of segments.
-        Use a while loop because we merge items which changes indices.
+        Consumes the input left to right onto an output stack, so merges are
+        O(1) appends/pops instead of O(N) list deletions:
+        - merge_prev pops the stack top into the current segment,
+        - merge_next consumes the next input segment,
+        and the merged segment is re-evaluated, exactly like the old
+        index-based loop.
         """
-        i = 0
-        while i < len(segments):
-            seg = segments[i]
+        out = []
+        j = 0
+        n = len(segments)
+        seg = None
+
+        # The same segment text is classified repeatedly (as current, prev and
+        # next, and spaces recur constantly), so intern predicate results in
+        # per-call dict caches.
+        sep_cache = {}
+        inv_cache = {}
+        _is_separator = self.is_separator
+        _check_invalid = self.check_invalid_single
+
+        def is_sep(s):
+            v = sep_cache.get(s)
+            if v is None:
+                v = sep_cache[s] = _is_separator(s)
+            return v
+
+        def is_invalid_single(s):
+            v = inv_cache.get(s)
+            if v is None:
+                v = inv_cache[s] = _check_invalid(s)
+            return v
+
+        skip_separators = self._separators_never_trigger
+
+        # Hoist the per-iteration attribute loads out of the loop: each
+        # self.X access is a dict probe per segment otherwise.
+        exact_get = self._exact_rules.get
+        scan_rules = self._scan_rules
+        master = self._regex_master
+        master_match = master.match if master is not None else None
+        out_append = out.append
+        out_pop = out.pop
+
+        while True:
+            if seg is None:
+                if j >= n:
+                    break
+                seg = segments[j]
+                j += 1
+
+            # Separators proven unable to trigger any rule (checked at load)
+            # go straight to the output, skipping the rule scan entirely.
+            if skip_separators and is_sep(seg):
+                out_append(seg)
+                seg = None
+                continue
+
             rule_applied = False
-            
-            for rule in self.rules:
+
+            # Segments with an exact-match rule get a pre-merged candidate
+            # list (that rule plus the scan rules, in global priority order);
+            # everything else scans only the regex/complexity rules.
+            candidates = exact_get(seg) or scan_rules
+
+            # Index of the first regex rule matching seg (-1 = none, -2 = not
+            # yet computed). Evaluated lazily with ONE master-regex call.
+            master_first = -2
+
+            seg_len = len(seg)
+            # A $-anchored pattern can still match before a trailing newline,
+            # so the upper length bound is only trusted without one.
+            gate_max = not seg.endswith('\n')
+
+            for rule in candidates:
+                # Length gate: skip rules whose trigger cannot match a
+                # segment of this length (e.g. single-char-only rules on
+                # multi-char words) without entering the regex engine.
+                if rule.min_len > seg_len or (gate_max and rule.max_len < seg_len):
+                    continue
+
                 # 1. Check Trigger
-                trigger = rule["trigger"]
-                t_type = trigger["type"]
+                tkind = rule.tkind
                 match = False
-                
-                if t_type == "exact_match":
-                    if seg == trigger["value"]:
+
+                if tkind == TKIND_EXACT:
+                    if seg == rule.tval:
                         match = True
-                elif t_type == "regex":
-                    if trigger["regex_obj"].match(seg):
+                elif tkind == TKIND_REGEX:
+                    if master_first == -2:
+                        m = master_match(seg)
+                        master_first = int(m.lastgroup[1:]) if m else -1
+                    ridx = rule.regex_idx
+                    if ridx == master_first:
                         match = True
-                elif t_type == "complexity_check":
-                    if trigger["value"] == "is_invalid_single":
-                        if self.check_invalid_single(seg):
+                    elif -1 < master_first < ridx:
+                        # A higher-priority regex rule matched but failed its
+                        # conditions; fall back to an individual re-check.
+                        if rule.regex.match(seg):
                             match = True
-                            
+                elif tkind == TKIND_COMPLEX:
+                    if rule.tval == "is_invalid_single":
+                        if is_invalid_single(seg):
+                            match = True
+
                 if not match:
                     continue
 
                 # 2. Check Conditions
-                conditions_met = True
-                checks = rule.get("checks", [])
-                
-                if checks: # Only iterate if there are checks
-                    for check in checks:
-                        target = check.get("target")
-                        target_seg = None
-                        
-                        # Resolve target
-                        if target == "prev":
-                            if i > 0: target_seg = segments[i-1]
-                        elif target == "next":
-                            if i + 1 < len(segments): target_seg = segments[i+1]
-                        elif target == "context" or target == "current":
-                            target_seg = segments[i]
-                        
-                        # Check existence
-                        # Default exists requirement is True if not specified? 
-                        # Logic in original: if check.get("exists") is True...
-                        must_exist = check.get("exists", False) 
-                        if must_exist and target_seg is None:
-                            conditions_met = False
-                            break
-                        
-                        if target_seg is None:
-                            # If it doesn't exist and we didn't require it, 
-                            # check if we strictly required a VALUE check on a potentially non-existent item?
-                            # If "exists" is false (default), and item missing, do we pass?
-                            # Original logic: if target_seg is None and not check.get("exists", True): continue
-                            # If check value is implicitly required, target MUST exist unless "exists": false explicitly allows missing.
-                            # Let's simplify: if target missing, condition is met ONLY IF we didn't require existence/value check.
-                            # But usually we check value on target.
-                            
-                            # Let's stick to strict:
-                            # If target is None, we can't check value. 
-                            # If "check" or "value" keys are present, we imply we need target.
-                            if "check" in check or "value" in check:
-                                # We needed to check something on it, but it's gone.
-                                conditions_met = False
-                                break
-                            
-                            # If no value check (just existence check which was false?), continue
-                            continue
-                            
-                        # Value checks
-                        c_type = check.get("check") 
-                        expected = check.get("value")
-                        
-                        if c_type == "is_separator":
-                            if self.is_separator(target_seg) != expected:
-                                conditions_met = False
-                                break
-                        elif c_type == "is_isolated":
-                            prev_sep = True
-                            if i > 0: prev_sep = self.is_separator(segments[i-1])
-                            
-                            next_sep = True
-                            if i + 1 < len(segments): next_sep = self.is_separator(segments[i+1])
-                            
-                            is_iso = prev_sep and next_sep
-                            if is_iso != expected:
-                                conditions_met = False
-                                break
-                    
-                    if not conditions_met:
-                        continue
-                
+                # Each rule's checks were partially evaluated into a single
+                # specialized closure at load time (target resolution,
+                # existence gating and kind dispatch are already baked in).
+                cond = rule.cond
+                if cond is not None and not cond(seg, out, segments, j, n, is_sep):
+                    continue
+
                 # 3. Apply Action
-                action = rule["action"]
-                if action == "merge_next":
-                    if i + 1 < len(segments):
-                        segments[i] = seg + segments[i+1]
-                        del segments[i+1]
+                action = rule.action
+                if action == ACTION_MERGE_NEXT:
+                    if j < n:
+                        seg = seg + segments[j]
+                        j += 1
                         rule_applied = True
-                        break # Break rule loop, restart at SAME index 'i' (it has new content)
-                elif action == "merge_prev":
-                    if i > 0:
-                        segments[i-1] = segments[i-1] + seg
-                        del segments[i]
-                        i -= 1 # Shift back to re-evaluate merged content at i-1
+                        break # Break rule loop, re-evaluate the merged segment
+                elif action == ACTION_MERGE_PREV:
+                    if out:
+                        seg = out_pop() + seg
                         rule_applied = True
-                        break
-                elif action == "keep":
-                    i += 1
+                        break # Break rule loop, re-evaluate the merged segment
+                elif action == ACTION_KEEP:
+                    out_append(seg)
+                    seg = None
                     rule_applied = True
                     break # Break rule loop, move to next
-            
+
             if not rule_applied:
-                i += 1
-        
-        return segments
+                out_append(seg)
+                seg = None
+
+        return out
@@ -1,15 +1,146 @@
 import os
+import re
 import math
 import json
+import mmap
+import pickle
+import functools
 import unicodedata
 
+# Optional: orjson parses the large frequency JSON ~2-3x faster than stdlib json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 from .normalization import KhmerNormalizer
 from .rule_engine import RuleBasedEngine
 
+# Terminal marker inside trie nodes. The empty string can never collide with
+# a real character key.
+_WORD_END = ''
+
+# Character-class bitmasks. One table index + AND replaces the chains of
+# range comparisons the per-character helpers below used to redo on every
+# call. The table covers the whole BMP (64 KB, ~24ms to build at import),
+# so only astral codepoints fall back to the Unicode-category check;
+# supplementary-plane separators (mostly emoji) go through a memo instead.
+CC_BASE = 0x01   # Consonant or independent vowel (valid cluster/word start)
+CC_CONS = 0x02   # Consonant (valid Coeng subscript)
+CC_DEPV = 0x04   # Dependent vowel
+CC_EXT = 0x08    # Cluster extender (dependent vowel, sign, 0x17D3, 0x17DD)
+CC_DIGIT = 0x10  # ASCII or Khmer digit
+CC_KHMER = 0x20  # Khmer block or Khmer Symbols block
+CC_SEP = 0x40    # Separator (Khmer punctuation/currency or Unicode P/S/Z)
+
+_CC_LIMIT = 0x10000
+
+def _build_cc_table():
+    table = bytearray(_CC_LIMIT)
+    for code in range(_CC_LIMIT):
+        bits = 0
+        if 0x1780 <= code <= 0x17B3:
+            bits |= CC_BASE
+        if 0x1780 <= code <= 0x17A2:
+            bits |= CC_CONS
+        if 0x17B6 <= code <= 0x17C5:
+            bits |= CC_DEPV
+        if (0x17B6 <= code <= 0x17D1) or code == 0x17D3 or code == 0x17DD:
+            bits |= CC_EXT
+        if (0x30 <= code <= 0x39) or (0x17E0 <= code <= 0x17E9):
+            bits |= CC_DIGIT
+        if (0x1780 <= code <= 0x17FF) or (0x19E0 <= code <= 0x19FF):
+            bits |= CC_KHMER
+        # Khmer punctuation 0x17D4-0x17DA plus the Riel sign 0x17DB, then the
+        # generic Punctuation/Symbol/Separator categories (same rule as the
+        # old _is_separator body).
+        if 0x17D4 <= code <= 0x17DB or unicodedata.category(chr(code))[0] in ('P', 'S', 'Z'):
+            bits |= CC_SEP
+        table[code] = bits
+    return bytes(table)
+
+_CC_TABLE = _build_cc_table()
+
+@functools.lru_cache(maxsize=None)
+def _is_sep_past_table(code):
+    """
+    Separator (P/S/Z category) check for codepoints beyond the class table,
+    i.e. the supplementary planes. Memoized: real text repeats the same
+    handful of emoji codepoints, so each distinct one pays the Unicode
+    database lookup once. (Extending the dense table past the BMP would mean
+    scanning another 1M codepoints at import; the memo costs nothing up
+    front.)
+    """
+    return unicodedata.category(chr(code))[0] in ('P', 'S', 'Z')
+
+# Coeng Ro ordering swap patterns, compiled once at import; the old
+# per-call re.compile inside _generate_variants paid compilation (cache
+# lookup at best) for every dictionary and frequency word.
+# Pattern 1: Coeng Ro followed by Other Coeng
+_CR_RO_FIRST = re.compile(r'(\u17D2\u179A)(\u17D2[^\u179A])')
+# Pattern 2: Other Coeng followed by Coeng Ro
+_CR_RO_LAST = re.compile(r'(\u17D2[^\u179A])(\u17D2\u179A)')
+
+# Shared result for the no-variant majority; keeps the early-out below
+# allocation-free.
+_NO_VARIANTS = frozenset()
+
+@functools.lru_cache(maxsize=None)
+def _generate_variants(word):
+    """
+    Generates interchangeable variants for a word.
+    1. Coeng Ta (\u17D2\u178F) <-> Coeng Da (\u17D2\u178D)
+    2. Coeng Ro (\u17D2\u179A) ordering with other Coengs
+
+    Memoized: the dictionary and frequency loaders call this for largely
+    overlapping word lists, so the second pass is cache hits. The frozenset
+    return keeps cached values safely immutable.
+    """
+    # Every variant rule rewrites a Coeng pair (Ta/Da swap, Ro reorder), so
+    # words without Coeng — the majority of the dictionary — exit on a single
+    # substring test before any set or match object is built.
+    if '្' not in word:
+        return _NO_VARIANTS
+
+    variants = set()
+
+    # 1. Coeng Ta <-> Coeng Da
+    # We can simply replace all instances.
+    # Combinatorial: if a word has 2 instances, do we need all 4 permutations?
+    # Usually mixed usage is rare. Swapping ALL is the most robust simple approach.
+    # Or simply generate "All Ta" and "All Da" versions.
+
+    coeng_ta = '\u17D2\u178F'
+    coeng_da = '\u17D2\u178A'
+
+    if coeng_ta in word:
+        variants.add(word.replace(coeng_ta, coeng_da))
+    if coeng_da in word:
+        variants.add(word.replace(coeng_da, coeng_ta))
+
+    # 2. Coeng Ro Ordering
+    # Pattern: (Coeng Ro)(Other Coeng) <-> (Other Coeng)(Coeng Ro)
+    # Apply the swaps to the word and its Ta/Da variants alike.
+    base_set = {word} | variants
+    final_variants = set(variants)
+
+    for w in base_set:
+        # Apply Swap 1: Ro -> Other ==> Other -> Ro
+        if _CR_RO_FIRST.search(w):
+            final_variants.add(_CR_RO_FIRST.sub(r'\2\1', w))
+
+        # Apply Swap 2: Other -> Ro ==> Ro -> Other
+        if _CR_RO_LAST.search(w):
+            final_variants.add(_CR_RO_LAST.sub(r'\2\1', w))
+
+    return frozenset(final_variants)
+
 class KhmerSegmenter:
-    def __init__(self, dictionary_path, frequency_path="khmer_word_frequencies.json"):
+    def __init__(self, dictionary_path, frequency_path="khmer_word_frequencies.json", cache_size=100000):
         """
         Initialize the segmenter by loading the dictionary and word frequencies.
+        :param cache_size: Max entries for the per-line segmentation LRU cache (0 disables caching).
         """
         self.words = set()
         self.normalizer = KhmerNormalizer()
@@ -26,95 +157,279 @@ class KhmerSegmenter:
             is_separator_func=self._is_separator
         )
         
-        self._load_dictionary(dictionary_path)
-        self._load_frequencies(frequency_path)
+        # Memo for the unknown-merge pass: segment text -> is_known. The same
+        # words and separators recur across lines, so classification is paid
+        # once per distinct segment (vocabulary-bounded, cleared on dict edits).
+        self._known_cache = {}
+
+        # Fast path: one unpickle restores the whole built state (word set,
+        # costs and trie) and skips the loads and the trie build entirely —
+        # measured roughly twice as fast as rebuilding the trie alone. The
+        # per-file sidecars inside the loaders still soften a miss here
+        # (e.g. when only one of the two inputs changed).
+        if not self._load_segmenter_cache(dictionary_path, frequency_path):
+            self._load_dictionary(dictionary_path)
+            self._load_frequencies(frequency_path)
+            self._build_trie()
+            self._save_segmenter_cache(dictionary_path, frequency_path)
+
+        # Memoize whole-line segmentation. Corpora repeat headers, punctuation-only
+        # lines and duplicated sentences, so identical inputs are common.
+        if cache_size and cache_size > 0:
+            self._segment_cached = functools.lru_cache(maxsize=cache_size)(self._segment_impl)
+        else:
+            self._segment_cached = self._segment_impl
+
+    @staticmethod
+    def _iter_dict_lines(path):
+        """
+        Yield decoded lines from the dictionary file via mmap.
+        Avoids the transient multi-MB string of a text-mode read, and the mapped
+        pages are shared through the page cache across worker processes.
+        """
+        with open(path, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return  # Empty file
+            try:
+                pos = 0
+                size = len(mm)
+                while pos < size:
+                    nl = mm.find(b'\n', pos)
+                    if nl == -1:
+                        nl = size
+                    yield mm[pos:nl].decode('utf-8')
+                    pos = nl + 1
+            finally:
+                mm.close()
+
+    # Bump when the load-time filtering/variant logic below changes, so stale
+    # sidecar caches regenerate instead of serving an old word set.
+    _DICT_CACHE_VERSION = 1
 
     def _load_dictionary(self, path):
         if not os.path.exists(path):
             raise FileNotFoundError(f"Dictionary not found at {path}")
-            
-        with open(path, 'r', encoding='utf-8') as f:
-            for line in f:
-                word = line.strip().replace('\u200b', '').replace('\u200c', '').replace('\u200d', '')
-                if word:
-                    # Filter out single-character words that are NOT valid base characters
-                    if len(word) == 1 and not self._is_valid_single_base_char(word):
-                        continue
-                        
-                    self.words.add(word)
-                    if len(word) > self.max_word_length:
-                        self.max_word_length = len(word)
-                    
-                    # Generate variants (Ta/Da, Ro Order)
-                    variants = self._generate_variants(word)
-                    for v in variants:
-                        self.words.add(v)
-                        if len(v) > self.max_word_length:
-                            self.max_word_length = len(v)
+
+        # Variant generation and the compound-OR filter are O(|words|) Python
+        # loops over static data; like the frequency costs, the final word
+        # set is cached in a pickle sidecar keyed to the file's mtime.
+        cache_path = path + '.pkl'
+        if self._load_dict_cache(cache_path, path):
+            return
+
+        for line in self._iter_dict_lines(path):
+            word = line.strip().replace('\u200b', '').replace('\u200c', '').replace('\u200d', '')
+            if word:
+                # Filter out single-character words that are NOT valid base characters
+                if len(word) == 1 and not self._is_valid_single_base_char(word):
+                    continue
+
+                # Reject words containing ៗ (Repetition Mark, enforced as a
+                # separate segment) and words starting with Coeng (\u17D2, an
+                # invalid word start) at read time instead of collecting them
+                # into a removal set afterwards. Variants inherit both
+                # properties (the swaps neither add ៗ nor touch a leading
+                # Coeng), so filtering the source word covers them too.
+                if 'ៗ' in word or word.startswith('\u17D2'):
+                    continue
+
+                self.words.add(word)
+
+                # Generate variants (Ta/Da, Ro Order)
+                self.words.update(_generate_variants(word))
 
         # Filter out compound words containing "ឬ" (or) to force splitting
         # e.g. "ឬហៅ" -> remove if "ហៅ" is invalid? No, if "ហៅ" IS valid.
         # "មែនឬទេ" -> remove if "មែន" and "ទេ" are valid.
+        # This is the one filter that genuinely needs the fully-loaded set
+        # (it depends on membership of the parts); the generator prescreens
+        # with a C-level substring test so the case analysis only touches
+        # words that contain the OR ligature.
         words_to_remove = set()
-        for word in self.words:
-            if "ឬ" in word and len(word) > 1:
-                # Case 1: Starts with ឬ (e.g. ឬហៅ)
-                if word.startswith("ឬ"):
-                    suffix = word[1:]
-                    if suffix in self.words:
-                        words_to_remove.add(word)
-                # Case 2: Ends with ឬ (e.g. មកឬ)
-                elif word.endswith("ឬ"):
-                    prefix = word[:-1]
-                    if prefix in self.words:
-                        words_to_remove.add(word)
-                # Case 3: Middle (e.g. មែនឬទេ)
-                else:
-                    parts = word.split("ឬ")
-                    # If all parts are valid words (or empty strings from consecutive ORs), remove it
-                    if all((p in self.words or p == "") for p in parts):
-                         words_to_remove.add(word)
-            
-            # Filter out words containing ៗ (Repetition Mark) to enforce it as separate segment
-            if 'ៗ' in word:
-                words_to_remove.add(word)
-            
-            # Filter out words starting with Coeng (\u17D2) - these are invalid start of words
-            if word.startswith('\u17D2'):
-                words_to_remove.add(word)
+
+        for word in (w for w in self.words if "ឬ" in w and len(w) > 1):
+            # Case 1: Starts with ឬ (e.g. ឬហៅ)
+            if word.startswith("ឬ"):
+                suffix = word[1:]
+                if suffix in self.words:
+                    words_to_remove.add(word)
+            # Case 2: Ends with ឬ (e.g. មកឬ)
+            elif word.endswith("ឬ"):
+                prefix = word[:-1]
+                if prefix in self.words:
+                    words_to_remove.add(word)
+            # Case 3: Middle (e.g. មែនឬទេ)
+            else:
+                parts = word.split("ឬ")
+                # If all parts are valid words (or empty strings from consecutive ORs), remove it
+                if all((p in self.words or p == "") for p in parts):
+                     words_to_remove.add(word)
 
         # Manually exclude specific fragments that cause over-segmentation
         # words_to_remove.add('ត្តិ')
 
         if words_to_remove:
-            print(f"Removing {len(words_to_remove)} invalid words (compound ORs, start-with-Coeng) to enforce splitting.")
+            print(f"Removing {len(words_to_remove)} compound OR words to enforce splitting.")
             self.words -= words_to_remove
 
-        if "ៗ" in self.words:
-            self.words.remove("ៗ")
+        # Single C-level pass over the final set instead of tracking the
+        # running maximum word-by-word through loads and removals.
+        self.max_word_length = max(map(len, self.words), default=0)
 
-        # Re-calculate max_word_length after removal
-        self.max_word_length = 0
-        for word in self.words:
-             if len(word) > self.max_word_length:
-                 self.max_word_length = len(word)
-                 
         print(f"Loaded {len(self.words)} words. Max length: {self.max_word_length}")
 
-                     
+        self._save_dict_cache(cache_path)
+
+    def _load_dict_cache(self, cache_path, path):
+        """Load the filtered word set from the pickle sidecar, if current."""
+        try:
+            if os.path.getmtime(cache_path) < os.path.getmtime(path):
+                return False
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('version') != self._DICT_CACHE_VERSION:
+                return False
+            self.words = cached['words']
+            self.max_word_length = cached['max_word_length']
+        except (OSError, KeyError, AttributeError, pickle.UnpicklingError, EOFError):
+            return False
+        print(f"Loaded {len(self.words)} words (cached). Max length: {self.max_word_length}")
+        return True
+
+    def _save_dict_cache(self, cache_path):
+        """Best-effort write of the word-set sidecar (e.g. skipped on read-only installs)."""
+        payload = {
+            'version': self._DICT_CACHE_VERSION,
+            'words': self.words,
+            'max_word_length': self.max_word_length,
+        }
+        tmp_path = cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    # Bump when anything that feeds the built state changes shape — word
+    # filtering, cost computation or the trie layout.
+    _SEG_CACHE_VERSION = 1
+
+    def _load_segmenter_cache(self, dictionary_path, frequency_path):
+        """Restore the fully built state (words, costs, trie) from one sidecar."""
+        cache_path = dictionary_path + '.seg.pkl'
+        try:
+            cache_mtime = os.path.getmtime(cache_path)
+            if cache_mtime < os.path.getmtime(dictionary_path):
+                return False
+            if frequency_path and os.path.exists(frequency_path) and \
+                    cache_mtime < os.path.getmtime(frequency_path):
+                return False
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('version') != self._SEG_CACHE_VERSION:
+                return False
+            self.words = cached['words']
+            self.max_word_length = cached['max_word_length']
+            self.word_costs = cached['word_costs']
+            self.default_cost = cached['default_cost']
+            self.unknown_cost = cached['unknown_cost']
+            self._trie = cached['trie']
+        except (OSError, KeyError, AttributeError, pickle.UnpicklingError, EOFError):
+            return False
+        print(f"Loaded segmenter state (cached): {len(self.words)} words. Max length: {self.max_word_length}")
+        return True
+
+    def _save_segmenter_cache(self, dictionary_path, frequency_path):
+        """Best-effort write of the built-state sidecar (e.g. skipped on read-only installs)."""
+        payload = {
+            'version': self._SEG_CACHE_VERSION,
+            'words': self.words,
+            'max_word_length': self.max_word_length,
+            'word_costs': self.word_costs,
+            'default_cost': self.default_cost,
+            'unknown_cost': self.unknown_cost,
+            'trie': self._trie,
+        }
+        cache_path = dictionary_path + '.seg.pkl'
+        tmp_path = cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def _build_trie(self):
+        """
+        Build a character trie over the final word set.
+        The DP's word matching walks this trie once per start position
+        instead of slicing and hashing text[i:j] for every candidate length.
+
+        A static C trie (e.g. marisa-trie's prefixes()) would cut both the
+        per-character interpreter cost and the RAM footprint further, but the
+        Python package stays dependency-free by design; the C/Rust ports
+        under port/ already cover users who need native-speed matching.
+        """
+        root = {}
+        for word in self.words:
+            node = root
+            for ch in word:
+                node = node.setdefault(ch, {})
+            # Terminals carry the word's final cost, so a match needs neither
+            # a text[i:j] slice nor the get_word_cost dict probes.
+            node[_WORD_END] = self.get_word_cost(word)
+        self._trie = root
+
+    def add_word(self, word):
+        """Add a dictionary word at runtime, keeping set, trie and caches in sync."""
+        if word in self.words:
+            return
+        self.words.add(word)
+        if len(word) > self.max_word_length:
+            self.max_word_length = len(word)
+        node = self._trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[_WORD_END] = self.get_word_cost(word)
+        self._clear_segment_cache()
+
+    def remove_word(self, word):
+        """Remove a dictionary word at runtime, keeping set, trie and caches in sync."""
+        if word not in self.words:
+            return
+        self.words.discard(word)
+        node = self._trie
+        for ch in word:
+            node = node.get(ch)
+            if node is None:
+                return
+        node.pop(_WORD_END, None)
+        self._clear_segment_cache()
+
+    def _clear_segment_cache(self):
+        self._known_cache.clear()
+        cached = getattr(self, '_segment_cached', None)
+        if cached is not None and hasattr(cached, 'cache_clear'):
+            cached.cache_clear()
+
+
     def _is_valid_single_base_char(self, char):
         """
         Check if a single character is a valid base character (Consonant or Independent Vowel).
         These are the only characters that can validly stand alone as 1-char words.
         """
+        # Consonants 0x1780-0x17A2 and Independent Vowels 0x17A3-0x17B3
         code = ord(char)
-        # Consonants: 0x1780 - 0x17A2
-        if 0x1780 <= code <= 0x17A2:
-            return True
-        # Independent Vowels: 0x17A3 - 0x17B3
-        if 0x17A3 <= code <= 0x17B3:
-            return True
-        return False
+        return code < _CC_LIMIT and (_CC_TABLE[code] & CC_BASE) != 0
 
     def _is_invalid_single(self, seg):
         """Helper to determine if a segment is an invalid single character."""
@@ -149,69 +464,9 @@ class KhmerSegmenter:
             
         return True
 
-    def _generate_variants(self, word):
-        """
-        Generates interchangeable variants for a word.
-        1. Coeng Ta (\u17D2\u178F) <-> Coeng Da (\u17D2\u178D)
-        2. Coeng Ro (\u17D2\u179A) ordering with other Coengs
-        """
-        variants = set()
-        
-        # 1. Coeng Ta <-> Coeng Da
-        # We can simply replace all instances. 
-        # Combinatorial: if a word has 2 instances, do we need all 4 permutations?
-        # Usually mixed usage is rare. Swapping ALL is the most robust simple approach.
-        # Or simply generate "All Ta" and "All Da" versions.
-        
-        coeng_ta = '\u17D2\u178F'
-        coeng_da = '\u17D2\u178A'
-        
-        if coeng_ta in word:
-            variants.add(word.replace(coeng_ta, coeng_da))
-        if coeng_da in word:
-            variants.add(word.replace(coeng_da, coeng_ta))
-            
-        # Add generated variants to set so we process THEM for Ro-swap too
-        # But for simplicity, let's just add them to return set.
-        
-        # 2. Coeng Ro Ordering
-        # Pattern: (Coeng Ro)(Other Coeng) <-> (Other Coeng)(Coeng Ro)
-        # Coeng Ro: \u17D2\u179A
-        # Other Coeng: \u17D2 followed by NOT \u179A
-        
-        # Simplest way: Check for specific substrings and swap
-        # Regex approach is best, but Python 're' with overlapping replacement is tricky.
-        # But we don't expect overlapping Coeng sequences often.
-        
-        # Let's iterate over the word (and its Ta/Da variants also)
-        base_set = {word} | variants
-        final_variants = set(variants)
-        
-        import re
-        # Pattern 1: Coeng Ro followed by Other Coeng
-        # \u17D2\u179A (\u17D2[^\u179A])
-        p1 = re.compile(r'(\u17D2\u179A)(\u17D2[^\u179A])')
-        
-        # Pattern 2: Other Coeng followed by Coeng Ro
-        # (\u17D2[^\u179A]) \u17D2\u179A
-        p2 = re.compile(r'(\u17D2[^\u179A])(\u17D2\u179A)')
-        
-        for w in base_set:
-            # Apply Swap 1: Ro -> Other ==> Other -> Ro
-            # Use a loop to handle multiple occurrences
-            w_new = w
-            # Applying sub might replace all non-overlapping.
-            if p1.search(w):
-                w_new = p1.sub(r'\2\1', w)
-                final_variants.add(w_new)
-            
-            # Apply Swap 2: Other -> Ro ==> Ro -> Other
-            w_new2 = w
-            if p2.search(w):
-                w_new2 = p2.sub(r'\2\1', w)
-                final_variants.add(w_new2)
-                
-        return final_variants
+    # Bump when the cost computation below changes, so stale sidecar
+    # caches regenerate instead of silently serving old costs.
+    _FREQ_CACHE_VERSION = 1
 
     def _load_frequencies(self, path):
         if not path or not os.path.exists(path):
@@ -219,8 +474,24 @@ class KhmerSegmenter:
                 print(f"Frequency file not found at {path}. Using default costs.")
             return
 
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # Parsing the JSON and expanding variants dominates startup, which
+        # multiplies under the process-pool benchmark (every worker pays it).
+        # The computed costs are cached in a pickle sidecar next to the JSON
+        # and reused while the JSON is unchanged (mtime check), turning warm
+        # loads into a single unpickle with no per-word math. An mmap'd
+        # packed cost array would shave a little more but needs NumPy; the
+        # package stays dependency-free, and the pickle path is already far
+        # off the hot path.
+        cache_path = path + '.pkl'
+        if self._load_frequency_cache(cache_path, path):
+            return
+
+        if HAS_ORJSON:
+            with open(path, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
 
         # We will apply a minimum frequency floor to all words.
         # This treats "unseen dictionary words" and "rare corpus words" equally.
@@ -243,7 +514,7 @@ class KhmerSegmenter:
             effective_counts[word] = eff
             
             # Add variants with SAME frequency
-            variants = self._generate_variants(word)
+            variants = _generate_variants(word)
             for v in variants:
                 if v not in effective_counts:
                     effective_counts[v] = eff
@@ -266,15 +537,62 @@ class KhmerSegmenter:
             self.default_cost = -math.log10(min_prob)
             self.unknown_cost = self.default_cost + 5.0 
 
+            # -log10(count/total) == log10(total) - log10(count): hoisting the
+            # total out of the loop drops a division per word, and binding
+            # log10 locally avoids the attribute lookup per call. (NumPy could
+            # batch the whole thing in one np.log10, but the package stays
+            # dependency-free and this loop only runs on cold loads.)
+            log10 = math.log10
+            log_total = log10(total_tokens)
+            word_costs = self.word_costs
             for word, count in effective_counts.items():
-                prob = count / total_tokens
-                if prob > 0:
-                    self.word_costs[word] = -math.log10(prob)
+                # count >= min_freq_floor > 0, so the probability is always > 0
+                word_costs[word] = log_total - log10(count)
         
         print(f"Loaded frequencies for {len(self.word_costs)} words.")
         print(f"Default cost: {self.default_cost:.2f} (freq floor={min_freq_floor}), Unknown cost: {self.unknown_cost:.2f}")
 
+        self._save_frequency_cache(cache_path)
+
+    def _load_frequency_cache(self, cache_path, path):
+        """Load precomputed word costs from the pickle sidecar, if current."""
+        try:
+            if os.path.getmtime(cache_path) < os.path.getmtime(path):
+                return False
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('version') != self._FREQ_CACHE_VERSION:
+                return False
+            self.word_costs = cached['word_costs']
+            self.default_cost = cached['default_cost']
+            self.unknown_cost = cached['unknown_cost']
+        except (OSError, KeyError, AttributeError, pickle.UnpicklingError, EOFError):
+            return False
+        print(f"Loaded frequencies for {len(self.word_costs)} words (cached).")
+        return True
+
+    def _save_frequency_cache(self, cache_path):
+        """Best-effort write of the cost sidecar (e.g. skipped on read-only installs)."""
+        payload = {
+            'version': self._FREQ_CACHE_VERSION,
+            'word_costs': self.word_costs,
+            'default_cost': self.default_cost,
+            'unknown_cost': self.unknown_cost,
+        }
+        tmp_path = cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
     def get_word_cost(self, word):
+        # Only used when (re)building trie terminals and for introspection;
+        # the DP reads the cost cached on the terminal node instead.
         if word in self.word_costs:
             return self.word_costs[word]
         if word in self.words:
@@ -285,7 +603,7 @@ class KhmerSegmenter:
 
     def _is_khmer_char(self, char):
         code = ord(char)
-        return 0x1780 <= code <= 0x17FF or 0x19E0 <= code <= 0x19FF
+        return code < _CC_LIMIT and (_CC_TABLE[code] & CC_KHMER) != 0
 
     def _get_khmer_cluster_length(self, text, start_index):
         """
@@ -297,43 +615,39 @@ class KhmerSegmenter:
             return 0
             
         i = start_index
-        char = text[i]
-        code = ord(char)
-        
+        code = ord(text[i])
+
         # 1. Must start with Base Consonant or Independent Vowel
-        # Consonants: 0x1780 - 0x17A2
-        # Indep Vowels: 0x17A3 - 0x17B3
-        if not (0x1780 <= code <= 0x17B3):
+        if code >= _CC_LIMIT or not (_CC_TABLE[code] & CC_BASE):
             # Not a cluster start (could be symbol, number, or non-khmer)
             # If it's a coeng or vowel at the start, it's invalid/broken, but we treat as length 1
             return 1
 
         i += 1
-        
+
         while i < n:
-            char = text[i]
-            code = ord(char)
-            
+            code = ord(text[i])
+
             # Check for Coeng (Subscript)
-            if code == 0x17D2: 
+            if code == 0x17D2:
                 # Next char must be a consonant to form a valid subscript
-                if i + 1 < n and (0x1780 <= ord(text[i+1]) <= 0x17A2):
-                    i += 2
-                    continue
-                else:
-                    # Trailing coeng or invalid
-                    break
-            
-            # Check for Vowels and Signs (Dependent Vowels, Diacritics)
-            # Dependent Vowels: 0x17B6 - 0x17C5
-            # Signs: 0x17C6 - 0x17D1, 0x17D3, 0x17DD
-            if (0x17B6 <= code <= 0x17D1) or code == 0x17D3 or code == 0x17DD:
+                if i + 1 < n:
+                    nxt = ord(text[i+1])
+                    if nxt < _CC_LIMIT and (_CC_TABLE[nxt] & CC_CONS):
+                        i += 2
+                        continue
+                # Trailing coeng or invalid
+                break
+
+            # Check for Vowels and Signs (Dependent Vowels 0x17B6-0x17C5,
+            # Signs 0x17C6-0x17D1, 0x17D3, 0x17DD)
+            if code < _CC_LIMIT and (_CC_TABLE[code] & CC_EXT):
                 i += 1
                 continue
-                
+
             # End of cluster
             break
-            
+
         return i - start_index
     
     def _is_digit(self, text):
@@ -342,12 +656,14 @@ class KhmerSegmenter:
              # For segmentation logic, we usually check single chars or assume number detection handled elsewhere.
              # But for post-processing check "not self._is_digit(s)", we want to know if the segment is a number.
              # So we should return True only if ALL chars are digits.
-             return all(self._is_digit(c) for c in text)
-             
-        char = text[0]
-        code = ord(char)
-        # ASCII 0-9 (0x30-0x39) or Khmer 0-9 (0x17E0-0x17E9)
-        return (0x30 <= code <= 0x39) or (0x17E0 <= code <= 0x17E9)
+             # Inline the table lookup instead of recursing per character.
+             return all(c < _CC_LIMIT and _CC_TABLE[c] & CC_DIGIT
+                        for c in map(ord, text))
+
+        # ASCII 0-9 (0x30-0x39) or Khmer 0-9 (0x17E0-0x17E9): the class table
+        # folds both ranges into one bit test, no range branches per call.
+        code = ord(text[0])
+        return code < _CC_LIMIT and (_CC_TABLE[code] & CC_DIGIT) != 0
 
     def _get_number_length(self, text, start_index):
         """
@@ -383,105 +699,106 @@ class KhmerSegmenter:
 
 
     def _is_separator(self, char, next_char=None):
-        # Check for standard punctuation and Khmer punctuation
+        # Check for standard punctuation and Khmer punctuation.
+        # No per-call constants are built here: every separator range a
+        # literal ASCII set would cover is baked into the module-level class
+        # table at import time.
         try:
             code = ord(char)
             # Khmer Punctuation INCLUDING ៗ (\u17D7) AND ៛ (U+17DB) -> NO, U+17DB is Currency Reil
             # \u17D4 (។), \u17D5 (៕), \u17D6 (៖), \u17D7 (ៗ) etc
-            if 0x17D4 <= code <= 0x17DA:
-                return True
-            # Check for Khmer Currency Symbol ៛ (U+17DB)
-            if code == 0x17DB:
-                return True
-                
-            # Check for generic Punctuation (P), Symbols (S), and Separators (Z)
-            # This covers:
-            # P: Pc (Connector), Pd (Dash), Ps (Open), Pe (Close), Pi (Initial), Pf (Final), Po (Other)
-            # S: Sm (Math), Sc (Currency), Sk (Modifier), So (Other)
-            # Z: Zs (Space), Zl (Line), Zp (Paragraph)
-            cat = unicodedata.category(char)
-            if cat.startswith('P') or cat.startswith('S') or cat.startswith('Z'):
-                return True
-                
-            return False
+            # The class table folds these ranges plus the generic Punctuation
+            # (P), Symbol (S) and Separator (Z) categories into one bit;
+            # codepoints past the table fall back to the category check.
+            if code < _CC_LIMIT:
+                return (_CC_TABLE[code] & CC_SEP) != 0
+            return _is_sep_past_table(code)
         except:
             return False
 
-    def _is_acronym_start(self, text, index):
+    def segment(self, text, disable_post_processing=False):
         """
-        Checks if the character at index starts an acronym sequence (Cluster + .).
+        Segment the text using Viterbi Algorithm (Minimize Cost / Maximize Probability).
+        Results are cached per (text, disable_post_processing) pair.
         """
-        n = len(text)
-        # Need at least 2 chars: Cluster + .
-        if index + 1 >= n:
-            return False
-            
-        # Refine Acronym: Must start with Khmer Consonant or Independent Vowel
-        # Prevents ".." or ". " being detected as acronyms
-        code = ord(text[index])
-        if not (0x1780 <= code <= 0x17B3):
-            return False
-            
-        # Get cluster length
-        cluster_len = self._get_khmer_cluster_length(text, index)
-        if cluster_len == 0:
-            return False
-            
-        # Check if char AFTER cluster is dot
-        dot_index = index + cluster_len
-        if dot_index < n and text[dot_index] == '.':
-            return True
-            
-        return False
+        # The cached impl returns a tuple so cache hits can't be mutated by callers.
+        return list(self._segment_cached(text, disable_post_processing))
 
-    def _get_acronym_length(self, text, start_index):
+    def segment_batch(self, lines, disable_post_processing=False):
         """
-        Returns length of acronym sequence starting at start_index.
-        Matches pattern (Cluster + .)+
+        Segment many lines in one call.
+        Equivalent to [self.segment(line) for line in lines], but the
+        per-line attribute lookups are hoisted out of the loop, which adds
+        up on throughput-oriented workloads with short lines.
         """
-        n = len(text)
-        i = start_index
-        
-        while i < n:
-            # Check for Cluster + Dot
-            
-            # Strict Acronym: Must start with Khmer Consonant/Indep Vowel to continue chain
-            if i < n and not (0x1780 <= ord(text[i]) <= 0x17B3):
-                break
-                
-            cluster_len = self._get_khmer_cluster_length(text, i)
-            if cluster_len > 0:
-                dot_index = i + cluster_len
-                if dot_index < n and text[dot_index] == '.':
-                    i = dot_index + 1 # Advance past cluster and dot
-                    continue
-                else:
-                    break
-            else:
-                 break
-        
-        return i - start_index
-
-
+        cached = self._segment_cached
+        return [list(cached(line, disable_post_processing)) for line in lines]
 
-    def segment(self, text, disable_post_processing=False):
-        """
-        Segment the text using Viterbi Algorithm (Minimize Cost / Maximize Probability).
-        """
+    def _segment_impl(self, text, disable_post_processing=False):
         # 0. Normalize Text
         text = self.normalizer.normalize(text)
         
         n = len(text)
         if n == 0:
-            return []
+            return ()
+
+        # One linear sweep classifies every position up front; the DP then
+        # indexes codes/cc instead of re-calling the per-character helpers
+        # (each a Python call + ord) at every position it revisits. A plain
+        # list beats array('I') here: the DP reads codes[i] as a Python int
+        # anyway, and array indexing re-boxes on every access.
+        codes = list(map(ord, text))
+        cc = bytearray(n)
+        for k, code in enumerate(codes):
+            if code < _CC_LIMIT:
+                cc[k] = _CC_TABLE[code]
+            elif _is_sep_past_table(code):
+                cc[k] = CC_SEP
+
+        # ext_run[k]: length of the cluster-extension run starting at k —
+        # Coeng+consonant pairs and dependent vowels/signs, exactly the
+        # continuations _get_khmer_cluster_length accepts after a base char.
+        # One right-to-left pass makes every cluster length an O(1) read
+        # (1 + ext_run[i+1] from a base at i) instead of a forward walk that
+        # re-scans the same extensions for overlapping start positions.
+        ext_run = [0] * (n + 2)
+        for k in range(n - 1, -1, -1):
+            code = codes[k]
+            if code == 0x17D2:
+                # Valid only as Coeng + subscript consonant; a trailing or
+                # dangling Coeng ends the run (ext_run[k] stays 0).
+                if k + 1 < n and cc[k + 1] & CC_CONS:
+                    ext_run[k] = 2 + ext_run[k + 2]
+            elif cc[k] & CC_EXT:
+                ext_run[k] = 1 + ext_run[k + 1]
 
-        # dp[i] stores the best (cost, last_word_start_index) to reach index i
-        # We initialize with infinity
-        dp = [(float('inf'), -1)] * (n + 1)
-        dp[0] = (0.0, -1) 
+        # dp_cost[i]/dp_prev[i] hold the best cost and last word start to
+        # reach index i. Parallel lists instead of (cost, prev) tuples: each
+        # relaxation is two list stores rather than a tuple allocation, and
+        # reads skip the tuple indexing.
+        #
+        # A Numba-JITted kernel over int32 codepoints and a flattened CSR trie
+        # would make this loop native-speed, but it needs NumPy + a JIT
+        # runtime, warms up per process, and this package stays pure Python;
+        # the same applies to a Cython build of the kernel, which would add a
+        # compile toolchain and per-platform wheels for a DP the C/Rust ports
+        # under port/ already provide at native speed.
+        inf = float('inf')
+        dp_cost = [inf] * (n + 1)
+        dp_prev = [-1] * (n + 1)
+        dp_cost[0] = 0.0
+
+        # Locals for everything the loop body touches per position: attribute
+        # and global lookups cost a dict probe each, LOAD_FAST doesn't.
+        trie = self._trie
+        unknown_cost = self.unknown_cost
+        default_cost = self.default_cost
+        word_end = _WORD_END
+        get_number_length = self._get_number_length
 
         for i in range(n):
-            if dp[i][0] == float('inf'): continue
+            base_cost = dp_cost[i]
+            if base_cost == inf: continue
             
             # Constraint Check & Fallback
             # If we violate Khmer constraints, we MUST NOT start a normal word/cluster segment.
@@ -493,84 +810,102 @@ class KhmerSegmenter:
             # This obligates attachment. If we are here, it means we didn't attach.
             # We strictly enforce attachment IF the current char is a valid subscript candidate (Consonant).
             # If current char is NOT a consonant (e.g. space, punctuation), the Coeng matches nothing.
-            if i > 0 and text[i-1] == '\u17D2':
-                # Check if valid subscript (Consonant)
-                if '\u1780' <= text[i] <= '\u17A2':
-                    # continue # Valid consonant shoud have been attached. Block split.
-                    # FIX: If we blocked here, and there is no other path (e.g. orphan Coeng), we crash.
-                    # We must allow recovery.
-                    force_repair = True 
-                else:
-                    force_repair = True # Stray Coeng. Force single-char consumption of current char.
-            
+            if i > 0 and codes[i-1] == 0x17D2:
+                # Whether the current char is a valid subscript consonant or
+                # not, the split is invalid: a consonant should have been
+                # attached, anything else leaves a stray Coeng. Either way we
+                # recover by force-consuming one char (blocking outright could
+                # strand the DP on orphan Coengs).
+                force_repair = True
+
             # 2. Current char is Dependent Vowel.
             # Must attach to previous. If we start here, it's isolated.
-            if '\u17B6' <= text[i] <= '\u17C5':
+            if cc[i] & CC_DEPV:
                 force_repair = True
 
             if force_repair:
                 # RECOVERY MODE: Consume 1 character as "Invalid/Unknown" with high penalty
                 # This ensures we don't crash on " ា" or "ក្ "
                 next_idx = i + 1
-                new_cost = dp[i][0] + self.unknown_cost + 50.0 # Huge penalty
+                new_cost = base_cost + unknown_cost + 50.0 # Huge penalty
                 if next_idx <= n:
-                    if new_cost < dp[next_idx][0]:
-                        dp[next_idx] = (new_cost, i)
+                    if new_cost < dp_cost[next_idx]:
+                        dp_cost[next_idx] = new_cost
+                        dp_prev[next_idx] = i
                 continue # Skip normal processing
 
 
             # 1. Number / Digit Grouping
             # Only digits are grouped. Currency symbols are treated as separators.
-            is_digit = self._is_digit(text[i])
-            
-            if is_digit:
-                num_len = self._get_number_length(text, i)
+            if cc[i] & CC_DIGIT:
+                num_len = get_number_length(text, i)
                 next_idx = i + num_len
-                step_cost = 1.0 
-                if dp[i][0] + step_cost < dp[next_idx][0]:
-                    dp[next_idx] = (dp[i][0] + step_cost, i)
+                new_cost = base_cost + 1.0
+                if new_cost < dp_cost[next_idx]:
+                    dp_cost[next_idx] = new_cost
+                    dp_prev[next_idx] = i
             
             # 2. Separators (If not already handled as number start)
             # Only treat as separator if it wasn't a valid currency start
-            elif self._is_separator(text[i]):
+            elif cc[i] & CC_SEP:
                  next_idx = i + 1
-                 step_cost = 0.1 
-                 if dp[i][0] + step_cost < dp[next_idx][0]:
-                     dp[next_idx] = (dp[i][0] + step_cost, i)
+                 new_cost = base_cost + 0.1
+                 if new_cost < dp_cost[next_idx]:
+                     dp_cost[next_idx] = new_cost
+                     dp_prev[next_idx] = i
             
-            # 3. Acronym Grouping
-            if self._is_acronym_start(text, i):
-                acr_len = self._get_acronym_length(text, i)
-                next_idx = i + acr_len
-                # Acronyms are valid tokens but should not override common words + dot.
-                # Use default cost to ensure it's preferred over Unknown+Dot but not CommonWord+Dot
-                step_cost = self.default_cost
-                if dp[i][0] + step_cost < dp[next_idx][0]:
-                    dp[next_idx] = (dp[i][0] + step_cost, i)
+            # 3. Acronym Grouping: (Cluster + .)+ sequences. The start test
+            # must see a Khmer consonant/independent vowel (keeps ".." or
+            # ". " from matching), with a dot right after the cluster; both
+            # the test and the chain walk read cluster ends from ext_run
+            # instead of re-scanning clusters forward per position.
+            if cc[i] & CC_BASE:
+                dot_index = i + 1 + ext_run[i + 1]
+                if dot_index < n and codes[dot_index] == 0x2E:
+                    next_idx = dot_index + 1
+                    while next_idx < n and cc[next_idx] & CC_BASE:
+                        dot_index = next_idx + 1 + ext_run[next_idx + 1]
+                        if dot_index < n and codes[dot_index] == 0x2E:
+                            next_idx = dot_index + 1
+                        else:
+                            break
+                    # Acronyms are valid tokens but should not override common words + dot.
+                    # Use default cost to ensure it's preferred over Unknown+Dot but not CommonWord+Dot
+                    new_cost = base_cost + default_cost
+                    if new_cost < dp_cost[next_idx]:
+                        dp_cost[next_idx] = new_cost
+                        dp_prev[next_idx] = i
 
             # 3. Try to match words from the dictionary
-            end_limit = min(n, i + self.max_word_length)
-            
-            for j in range(i + 1, end_limit + 1):
-                word = text[i:j]
-                if word in self.words:
-                    word_cost = self.get_word_cost(word)
-                    new_cost = dp[i][0] + word_cost
-                    if new_cost < dp[j][0]:
-                        dp[j] = (new_cost, i)
+            # A single trie walk from i visits every dictionary word starting
+            # here; the walk ends as soon as no word continues, so neither
+            # max_word_length probing nor per-length substring hashing is needed.
+            node = trie
+            j = i
+            while j < n:
+                node = node.get(text[j])
+                if node is None:
+                    break
+                j += 1
+                word_cost = node.get(word_end)
+                if word_cost is not None:
+                    new_cost = base_cost + word_cost
+                    if new_cost < dp_cost[j]:
+                        dp_cost[j] = new_cost
+                        dp_prev[j] = i
             
             # 4. Unknown Cluster/Char Fallback
-            if self._is_khmer_char(text[i]):
-                cluster_len = self._get_khmer_cluster_length(text, i)
-                
+            if cc[i] & CC_KHMER:
+                # O(1) via the precomputed extension runs; non-base starts
+                # (stray vowels/signs) count as length 1, same as the helper.
+                cluster_len = (1 + ext_run[i + 1]) if cc[i] & CC_BASE else 1
+
                 # Default Unknown Cost
-                step_cost = self.unknown_cost
-                
+                step_cost = unknown_cost
+
                 # Penalty for Invalid Single Consonants
-                if cluster_len == 1:
-                    char = text[i]
-                    if not self._is_valid_single_base_char(char):
-                         step_cost += 10.0 # Extra penalty for invalid single char
+                if cluster_len == 1 and not (cc[i] & CC_BASE):
+                    step_cost += 10.0 # Extra penalty for invalid single char
                 
                 # NOTE: If the cluster itself forms a word, it is handled in loop #2.
                 # This block handles the case where it is NOT a known word (or we want to consider it as unknown)
@@ -581,67 +916,74 @@ class KhmerSegmenter:
             else:
                 # Non-Khmer (Symbol, English, etc.)
                 cluster_len = 1
-                step_cost = self.unknown_cost # Treat as unknown
+                step_cost = unknown_cost # Treat as unknown
             
             next_idx = i + cluster_len
             if next_idx <= n:
-                 if dp[i][0] + step_cost < dp[next_idx][0]:
-                     dp[next_idx] = (dp[i][0] + step_cost, i)
+                 new_cost = base_cost + step_cost
+                 if new_cost < dp_cost[next_idx]:
+                     dp_cost[next_idx] = new_cost
+                     dp_prev[next_idx] = i
 
-        # Backtrack
-        segments = []
+        # Backtrack: count the segments in a first dp_prev walk, then fill a
+        # preallocated list right to left — no append regrowth, no [::-1] copy.
+        k = 0
         curr = n
         while curr > 0:
-            cost, prev = dp[curr]
-            if prev == -1: 
-                # Debugging info
-                reachable = [i for i, x in enumerate(dp) if x[1] != -1 or i==0]
-                max_reachable = max(reachable) if reachable else 0
+            prev = dp_prev[curr]
+            if prev == -1:
+                # Debugging info: highest index the DP reached. Scan backwards
+                # and stop at the first reachable entry instead of building a
+                # full list of every reachable index — pathological inputs in
+                # a batch would otherwise pay an O(n) allocation per failure.
+                max_reachable = next(
+                    (i for i in range(n, 0, -1) if dp_prev[i] != -1), 0)
                 snippet = text[max_reachable:min(n, max_reachable+20)]
                 raise ValueError(f"Could not segment text. Stuck at index {max_reachable} (total {n}). Next chars: {repr(snippet)}. Full text length: {len(text)}")
-            segments.append(text[prev:curr])
+            k += 1
+            curr = prev
+
+        raw_segments = [None] * k
+        curr = n
+        idx = k - 1
+        while curr > 0:
+            prev = dp_prev[curr]
+            raw_segments[idx] = text[prev:curr]
+            idx -= 1
             curr = prev
-            
-        raw_segments = segments[::-1]
         
 
         
         if disable_post_processing:
-            return raw_segments
-            
+            return tuple(raw_segments)
+
         # 4. Apply Rule-Based Post-Processing
         # This replaces the hardcoded "Pass 1" (Invalid Singles) and "Pass 2" (Heuristics)
+        # The rule engine stays a separate pass on purpose: its merges are
+        # driven by rules.json and re-evaluate merged segments, which cannot
+        # be interleaved with the unknown-merge walk without coupling the two.
         pass2_segments = self.rule_engine.apply_rules(raw_segments)
 
-        # Post-processing Pass 3: Merge Consecutive Unknowns
-        # Separators break the merge chain
+        return tuple(self._merge_unknowns(pass2_segments))
 
-        # Post-processing Pass 3: Merge Consecutive Unknowns
-        # Separators break the merge chain
+    def _merge_unknowns(self, segments):
+        """
+        Post-processing Pass 3: merge runs of consecutive unknown segments
+        in one linear walk. Separators break the merge chain, and so does a
+        script change (Khmer <-> non-Khmer) inside a run.
+        """
         final_segments = []
         unknown_buffer = []
-        
-        for seg in pass2_segments:
-            # Determine if current segment is KNOWN
-            is_known = False
-            if self._is_digit(seg[0]):
-                is_known = True
-            elif seg in self.words:
-                is_known = True
-            elif len(seg) == 1 and self._is_valid_single_base_char(seg):
-                is_known = True
-            elif self._is_separator(seg):
-                is_known = True
-            
-            # Known if Acronym (Check for dot in it?)
-            # Or assume if it was generated by acronym matching logic it's known.
-            # Since we can't tag it here easily, we rely on properties.
-            # Acronyms have dots.
-            if '.' in seg and len(seg) >= 2:
-                 # Rudimentary check, but if it has dot and >=2 chars, it is valid token (or at least we want to keep it).
-                 # Wait, URL or File path also matches this?
-                 # But Viterbi logic would have preferred dictionary words or split punctuation if not acronym.
-                 is_known = True
+        known_cache = self._known_cache
+        classify = self._segment_is_known
+
+        for seg in segments:
+            # Determine if current segment is KNOWN (memoized per distinct
+            # segment text — DP-side kind tags would not survive the rule
+            # engine's merges, so classification happens here).
+            is_known = known_cache.get(seg)
+            if is_known is None:
+                is_known = known_cache[seg] = classify(seg)
 
             if is_known:
                 if unknown_buffer:
@@ -664,9 +1006,44 @@ class KhmerSegmenter:
                 
         if unknown_buffer:
             final_segments.append("".join(unknown_buffer))
-            
+
         return final_segments
 
+    def _segment_is_known(self, seg):
+        """Classify a post-processed segment as known for the unknown-merge pass."""
+        if self._is_digit(seg[0]):
+            return True
+        if seg in self.words:
+            return True
+        if len(seg) == 1 and self._is_valid_single_base_char(seg):
+            return True
+        if self._is_separator(seg):
+            return True
+
+        # Known if Acronym (Check for dot in it?)
+        # Or assume if it was generated by acronym matching logic it's known.
+        # Since we can't tag it here easily, we rely on properties.
+        # Acronyms have dots.
+        if '.' in seg and len(seg) >= 2:
+            # Rudimentary check, but if it has dot and >=2 chars, it is valid token (or at least we want to keep it).
+            # Wait, URL or File path also matches this?
+            # But Viterbi logic would have preferred dictionary words or split punctuation if not acronym.
+            return True
+
+        return False
+
+@functools.lru_cache(maxsize=None)
+def get_segmenter(dictionary_path, frequency_path="khmer_word_frequencies.json", cache_size=100000):
+    """
+    Return a shared KhmerSegmenter for the given paths, constructing it on
+    first use. Repeated calls (servers, test suites, notebook reloads) skip
+    the dictionary/frequency loading entirely.
+    Note the instance is shared: runtime add_word/remove_word edits are seen
+    by every caller holding it.
+    """
+    return KhmerSegmenter(dictionary_path, frequency_path, cache_size=cache_size)
+
+
 if __name__ == "__main__":
     import sys
     dict_file = os.path.join(os.path.dirname(__file__), "dictionary_data", "khmer_dictionary_words.txt")
@@ -72,13 +72,18 @@ def main():
     print(f"Reading {args.input} (Limit: {args.limit})...")
     lines = []
     total_bytes = 0
-    with open(args.input, 'r', encoding='utf-8') as f:
-        for line in f:
+    # Binary read: byte sizes come straight from the raw lines, so nothing is
+    # re-encoded just to be measured (the old loader encoded every line back
+    # to UTF-8 and threw the bytes away). Same approach as the package CLI.
+    with open(args.input, 'rb') as f:
+        for raw in f:
             if args.limit > 0 and len(lines) >= args.limit: break
-            line = line.strip()
+            raw = raw.strip()
+            if not raw: continue
+            line = raw.decode('utf-8').strip() # Also strip Unicode whitespace
             if not line: continue
             lines.append(line)
-            total_bytes += len(line.encode('utf-8'))
+            total_bytes += len(raw)
             
     total_mb = total_bytes / (1024 * 1024)
     print(f"Loaded {len(lines)} lines ({total_mb:.2f} MB).")
@@ -1,31 +1,49 @@
 import json
+import mmap
 import sys
+from itertools import islice
+
+# Optional: orjson parses large frequency JSON several times faster
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def load_json(path):
+    if HAS_ORJSON:
+        # mmap the file and parse straight from the page cache: orjson
+        # accepts any buffer, so peak RSS is one dict instead of
+        # file bytes + str copy + dict.
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return orjson.loads(memoryview(mm))
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
 def compare_frequencies(new_path, backup_path, top_n=5000):
     print(f"Comparing top {top_n} words...")
     
-    with open(new_path, 'r', encoding='utf-8') as f:
-        new_freq = json.load(f)
-    
-    with open(backup_path, 'r', encoding='utf-8') as f:
-        backup_freq = json.load(f)
+    new_freq = load_json(new_path)
+    backup_freq = load_json(backup_path)
         
     print(f"New Total Words: {len(new_freq)}")
     print(f"Backup Total Words: {len(backup_freq)}")
     
-    # Get top N keys
-    new_top = list(new_freq.keys())[:top_n]
-    backup_top = list(backup_freq.keys())[:top_n]
-    
+    # Get top N keys — islice reads just the first top_n keys instead of
+    # materializing the full ~100k-element key list only to slice it.
+    new_top = set(islice(new_freq, top_n))
+    backup_top = set(islice(backup_freq, top_n))
+
     # Intersection
-    common = set(new_top) & set(backup_top)
+    common = new_top & backup_top
     overlap = len(common) / top_n * 100
-    
+
     print(f"Overlap in Top {top_n}: {len(common)}/{top_n} ({overlap:.2f}%)")
-    
+
     # Show some missing/new
-    new_only = set(new_top) - set(backup_top)
-    backup_only = set(backup_top) - set(new_top)
+    new_only = new_top - backup_top
+    backup_only = backup_top - new_top
     
     print("\nWords in New Top 50 but not in Backup Top 50 (Sample):")
     print(list(new_only)[:20])
@@ -73,8 +73,10 @@ def main():
     # 2. Run Python segmenter (Parallel)
     print(f"\n[Python Baseline] Running with {threads} processes...")
     start_py = time.time()
+    # chunksize batches lines per IPC round-trip; the default of 1 pays a
+    # pickle + queue hop per short line, which rivals the segmentation cost.
     with ProcessPoolExecutor(max_workers=threads, initializer=init_worker) as executor:
-        results_py = list(executor.map(segment_line, lines))
+        results_py = list(executor.map(segment_line, lines, chunksize=256))
     end_py = time.time()
     dur_py = end_py - start_py
     print(f"Python Baseline finished in {dur_py:.2f}s ({actual_limit/dur_py:.2f} lines/sec)")
@@ -41,16 +41,16 @@ def derive_compound_frequency(word, known_frequencies, segmenter):
     # We want to force split it.
     
     # Strategy: Remove the word from segmenter's dictionary temporarily if present.
-    original_words = segmenter.words.copy()
-    if word in segmenter.words:
-        segmenter.words.remove(word)
-        segmenter.max_word_length = 0 # Re-calc max length? Too expensive. Just assume it's fine.
-        # Actually, removing one word shouldn't break max_word_length unless it was the ONLY long word.
-        
+    # remove_word/add_word keep the word set, the matching trie and the
+    # segment cache in sync, so the forced split can't leak into later calls.
+    removed = word in segmenter.words
+    if removed:
+        segmenter.remove_word(word)
+
     segments = segmenter.segment(word)
-    
-    # Restore
-    segmenter.words = original_words
+
+    if removed:
+        segmenter.add_word(word)
     
     # Check if segments are valid known words
     # If any segment is unknown, we can't derive confident frequency (maybe 0 or default).
@@ -46,7 +46,9 @@ def batch_process(corpus_file, limit):
     print(f"Processing {corpus_file} to {output_file}...")
     
     count = 0
-    with open(corpus_file, "r", encoding="utf-8") as f_in, open(output_file, "w", encoding="utf-8") as f_out:
+    # 1MB buffers cut the syscall count on large corpus scans.
+    with open(corpus_file, "r", encoding="utf-8", buffering=1 << 20) as f_in, \
+         open(output_file, "w", encoding="utf-8", buffering=1 << 20) as f_out:
         for line in f_in:
             if limit and count >= limit:
                 break